@@ -1,33 +1,92 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.write_concern import WriteConcern
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
+import hashlib
 from datetime import datetime, timedelta
-import json
+from collections import deque
+import re
+import orjson
+import asyncio
 import httpx
-import networkx as nx
+import numpy as np
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection - the client is created per worker process in lifespan
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+MONGO_MIN_POOL_SIZE = 5
+# MONGO_MAX_POOL_SIZE is the total across all Uvicorn workers (WEB_CONCURRENCY)
+MONGO_MAX_POOL_SIZE = max(
+    int(os.environ.get("MONGO_MAX_POOL_SIZE", "50")) // int(os.environ.get("WEB_CONCURRENCY", "1")),
+    MONGO_MIN_POOL_SIZE
+)
+client: Optional[AsyncIOMotorClient] = None
+db = None
 
 # Groq API configuration
 GROQ_API_KEY = os.environ['GROQ_API_KEY']
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "openai/gpt-oss-20b"
+
+# How long identical project inputs reuse a cached Groq decomposition
+DECOMPOSITION_CACHE_TTL_SECONDS = 86400
+
+# Bound concurrent Groq requests so bursts of analyses stay under the rate limit
+GROQ_SEM = asyncio.Semaphore(int(os.environ.get("GROQ_MAX_CONCURRENCY", "8")))
+
+# Strips a leading ```json / ``` fence and a trailing ``` fence from LLM output
+MARKDOWN_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.M)
+
+# Shared Groq HTTP client - reuses pooled connections across requests
+groq_client = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    headers={
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {GROQ_API_KEY}"
+    }
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, db
+    client = AsyncIOMotorClient(
+        mongo_url,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=30000,
+        waitQueueTimeoutMS=5000,
+        serverSelectionTimeoutMS=3000,
+        compressors="zstd,zlib"
+    )
+    db = client[os.environ['DB_NAME']]
+    
+    # Indexes for the id lookups done on every chat/analyze/fetch request
+    await db.conversations.create_index("id", unique=True)
+    await db.project_estimates.create_index("id", unique=True)
+    await db.project_estimates.create_index("project_id")
+    await db.decomposition_cache.create_index("created_at", expireAfterSeconds=DECOMPOSITION_CACHE_TTL_SECONDS)
+    yield
+    await groq_client.aclose()
+    client.close()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -56,6 +115,8 @@ class ConversationState(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class TaskEstimate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     title: str
     description: str
@@ -67,6 +128,7 @@ class TaskEstimate(BaseModel):
     most_likely_days: float
     pessimistic_days: float
     expected_days: float
+    cost: Optional[float] = None
     risk: str = "medium"
     priority: Optional[str] = "medium"
 
@@ -94,68 +156,150 @@ DEFAULT_RATES = {
     "DevOps Engineer": 1800
 }
 
+# Conversation flow: current step -> (next step, context key for the user's answer, assistant reply)
+STEP_TABLE = {
+    "greeting": (
+        "details",
+        "initial_input",
+        "Great! Now I need more details:\n\n1. What's your preferred tech stack?\n2. What's your team size preference?\n3. What are the key deliverables/features?\n4. What's your budget range?"
+    ),
+    "details": (
+        "constraints",
+        "additional_details",
+        "Perfect! A few more questions:\n\n1. Any specific constraints or requirements?\n2. How would you rate the project complexity (simple/medium/complex)?\n3. Any existing assets or systems to integrate with?"
+    ),
+    "constraints": (
+        "ready_for_analysis",
+        "constraints",
+        "Excellent! I have all the information needed. Let me analyze your project and create a detailed breakdown with tasks, timeline, and cost estimates. This will take a moment..."
+    ),
+}
+
 # Groq client
-async def call_groq_api(messages, system_prompt="You are an expert IT project estimator."):
-    async with httpx.AsyncClient() as client:
-        try:
-            payload = {
-                "messages": [
-                    {"role": "system", "content": system_prompt}
-                ] + messages,
-                "model": "openai/gpt-oss-20b",
-                "temperature": 0.7,
-                "max_completion_tokens": 4096,
-                "top_p": 1,
-                "stream": False
-            }
+groq_backoff = wait_exponential_jitter(initial=1, max=30)
+
+def is_retryable_groq_error(exc: BaseException) -> bool:
+    """Retry on rate limiting (429) and transient Groq server errors"""
+    return isinstance(exc, httpx.HTTPStatusError) and (
+        exc.response.status_code == 429 or exc.response.status_code >= 500
+    )
+
+def groq_retry_wait(retry_state) -> float:
+    """Honour Groq's retry-after header, falling back to jittered exponential backoff"""
+    exc = retry_state.outcome.exception()
+    try:
+        return min(float(exc.response.headers["retry-after"]), 30.0)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return groq_backoff(retry_state)
+
+@retry(
+    retry=retry_if_exception(is_retryable_groq_error),
+    wait=groq_retry_wait,
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+async def stream_groq_completion(payload: dict) -> str:
+    """Stream a Groq chat completion and return the assembled message content"""
+    async with GROQ_SEM:
+        # Stream the completion and decode SSE chunks as they arrive
+        async with groq_client.stream("POST", GROQ_API_URL, json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                if response.status_code == 429 or response.status_code >= 500:
+                    response.raise_for_status()
+                raise HTTPException(status_code=500, detail=f"Groq API error: {response.text}")
             
-            response = await client.post(
-                GROQ_API_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {GROQ_API_KEY}"
-                },
-                json=payload,
-                timeout=30.0
-            )
+            content = []
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = orjson.loads(data)
+                if chunk.get("choices"):
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        content.append(delta)
+            return "".join(content)
+
+async def call_groq_api(messages, system_prompt="You are an expert IT project estimator."):
+    try:
+        payload = {
+            "messages": [
+                {"role": "system", "content": system_prompt}
+            ] + messages,
+            "model": GROQ_MODEL,
+            "temperature": 0.7,
+            "max_completion_tokens": 4096,
+            "top_p": 1,
+            "stream": True
+        }
+        
+        return await stream_groq_completion(payload)
             
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                raise HTTPException(status_code=500, detail=f"Groq API error: {response.text}")
-                
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error calling Groq API: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calling Groq API: {str(e)}")
 
 # Helper functions
-def calculate_pert_estimate(optimistic: float, most_likely: float, pessimistic: float) -> float:
-    """Calculate PERT expected duration"""
-    return (optimistic + 4 * most_likely + pessimistic) / 6
-
-def calculate_critical_path(tasks: List[Dict], dependencies: Dict[str, List[str]]) -> List[str]:
-    """Calculate critical path using NetworkX"""
-    G = nx.DiGraph()
+def calculate_pert_estimate(optimistic: np.ndarray, most_likely: np.ndarray, pessimistic: np.ndarray) -> np.ndarray:
+    """Calculate PERT expected duration (element-wise over task arrays)"""
+    return (optimistic + 4 * most_likely + pessimistic) * (1.0 / 6.0)
+
+def calculate_critical_path(tasks: List[Dict], dependencies: Dict[str, List[str]]) -> Tuple[List[str], float]:
+    """Calculate critical path (longest duration path) and its length via topological sort"""
+    durations = {task["id"]: task["expected_days"] for task in tasks}
+    if not durations:
+        return [], 0.0
     
-    # Add nodes with durations
-    for task in tasks:
-        G.add_node(task["id"], duration=task["expected_days"])
+    # No dependency edges - the longest single task is the critical path
+    if not any(dependencies.values()):
+        longest = max(durations, key=durations.get)
+        return [longest], durations[longest]
     
-    # Add edges for dependencies
+    indegree = {task_id: 0 for task_id in durations}
+    successors = {task_id: [] for task_id in durations}
+    
+    # Add edges for dependencies, ignoring references to unknown tasks
     for task_id, deps in dependencies.items():
+        if task_id not in durations:
+            continue
         for dep in deps:
-            G.add_edge(dep, task_id)
+            if dep in durations:
+                successors[dep].append(task_id)
+                indegree[task_id] += 1
     
-    # Calculate critical path (longest path)
-    try:
-        critical_path = nx.dag_longest_path(G, weight='duration')
-        return critical_path
-    except:
-        return []
-
-async def decompose_project_with_groq(project_data: dict) -> dict:
-    """Use Groq to decompose project into tasks"""
-    system_prompt = """You are an expert IT project estimator with deep knowledge of software development lifecycles. Decompose projects into comprehensive, detailed tasks across ALL development domains.
+    # Kahn's algorithm, relaxing the longest distance to each task in topological order
+    dist = dict(durations)
+    parent = {}
+    queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+    visited = 0
+    while queue:
+        u = queue.popleft()
+        visited += 1
+        for v in successors[u]:
+            if dist[u] + durations[v] > dist[v]:
+                dist[v] = dist[u] + durations[v]
+                parent[v] = u
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                queue.append(v)
+    
+    # Dependency cycle - no valid critical path
+    if visited < len(durations):
+        return [], 0.0
+    
+    # Walk back from the task that finishes last
+    node = max(dist, key=dist.get)
+    length = dist[node]
+    critical_path = [node]
+    while node in parent:
+        node = parent[node]
+        critical_path.append(node)
+    critical_path.reverse()
+    return critical_path, length
+
+SYSTEM_PROMPT_DECOMPOSE = """You are an expert IT project estimator with deep knowledge of software development lifecycles. Decompose projects into comprehensive, detailed tasks across ALL development domains.
 
 MANDATORY TASK CATEGORIES TO INCLUDE:
 
@@ -300,6 +444,17 @@ DEPENDENCY RULES:
 
 Be detailed and comprehensive. Include 15-30 tasks based on project complexity. CRITICAL: Return ONLY the JSON object, no additional text or explanations."""
 
+# Part of the decomposition cache key so prompt edits invalidate cached results
+SYSTEM_PROMPT_DECOMPOSE_HASH = hashlib.blake2b(SYSTEM_PROMPT_DECOMPOSE.encode(), digest_size=8).hexdigest()
+
+async def decompose_project_with_groq(project_data: dict) -> dict:
+    """Use Groq to decompose project into tasks, reusing cached results for identical inputs"""
+    cache_input = {"project": project_data, "model": GROQ_MODEL, "prompt": SYSTEM_PROMPT_DECOMPOSE_HASH}
+    cache_key = hashlib.blake2b(orjson.dumps(cache_input, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    cached = await db.decomposition_cache.find_one({"_id": cache_key}, projection={"decomposition": 1})
+    if cached:
+        return cached["decomposition"]
+    
     messages = [
         {
             "role": "user", 
@@ -307,16 +462,12 @@ Be detailed and comprehensive. Include 15-30 tasks based on project complexity.
         }
     ]
     
-    response = await call_groq_api(messages, system_prompt)
+    response = await call_groq_api(messages, SYSTEM_PROMPT_DECOMPOSE)
     
     # Parse JSON response
     try:
         # Clean the response - remove markdown formatting if present
-        clean_response = response.strip()
-        if clean_response.startswith('```json'):
-            clean_response = clean_response.replace('```json', '').replace('```', '').strip()
-        elif clean_response.startswith('```'):
-            clean_response = clean_response.replace('```', '').strip()
+        clean_response = MARKDOWN_FENCE_RE.sub('', response.strip())
         
         # Try to find JSON content if there's extra text
         json_start = clean_response.find('{')
@@ -324,9 +475,17 @@ Be detailed and comprehensive. Include 15-30 tasks based on project complexity.
         if json_start >= 0 and json_end > json_start:
             clean_response = clean_response[json_start:json_end]
         
-        parsed_data = json.loads(clean_response)
+        parsed_data = orjson.loads(clean_response.encode())
+        
+        # Cache only usable decompositions - the fallback below is never stored
+        if isinstance(parsed_data, dict) and isinstance(parsed_data.get("tasks"), list) and parsed_data["tasks"]:
+            await db.decomposition_cache.update_one(
+                {"_id": cache_key},
+                {"$set": {"decomposition": parsed_data, "created_at": datetime.utcnow()}},
+                upsert=True
+            )
         return parsed_data
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         # Fallback: Create a basic task structure if JSON parsing fails
         logger.error(f"Failed to parse Groq response. Falling back to basic structure.")
         logger.error(f"Raw response: {response[:500]}...")
@@ -418,7 +577,7 @@ async def start_conversation():
     )
     
     # Save to database
-    await db.conversations.insert_one(conversation.dict())
+    await db.conversations.insert_one(conversation.model_dump())
     return conversation
 
 @api_router.post("/chat/{conversation_id}")
@@ -427,52 +586,41 @@ async def chat_response(conversation_id: str, message: dict):
     user_message = message.get("content", "")
     
     # Retrieve conversation
-    conversation = await db.conversations.find_one({"id": conversation_id})
+    conversation = await db.conversations.find_one({"id": conversation_id}, projection={"current_step": 1, "_id": 0})
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    # Add user message
-    conversation["messages"].append({"role": "user", "content": user_message})
-    
     # Process based on current step
     current_step = conversation["current_step"]
     assistant_response = ""
+    update = {}
     
-    if current_step == "greeting":
-        # Parse initial project info
-        conversation["context"].update({
-            "initial_input": user_message
-        })
-        conversation["current_step"] = "details"
-        assistant_response = "Great! Now I need more details:\n\n1. What's your preferred tech stack?\n2. What's your team size preference?\n3. What are the key deliverables/features?\n4. What's your budget range?"
-        
-    elif current_step == "details":
-        conversation["context"].update({
-            "additional_details": user_message
-        })
-        conversation["current_step"] = "constraints"
-        assistant_response = "Perfect! A few more questions:\n\n1. Any specific constraints or requirements?\n2. How would you rate the project complexity (simple/medium/complex)?\n3. Any existing assets or systems to integrate with?"
-        
-    elif current_step == "constraints":
-        conversation["context"].update({
-            "constraints": user_message
-        })
-        conversation["current_step"] = "ready_for_analysis"
-        assistant_response = "Excellent! I have all the information needed. Let me analyze your project and create a detailed breakdown with tasks, timeline, and cost estimates. This will take a moment..."
-        
-    # Add assistant response
-    conversation["messages"].append({"role": "assistant", "content": assistant_response})
+    if current_step in STEP_TABLE:
+        next_step, context_key, assistant_response = STEP_TABLE[current_step]
+        update["$set"] = {"current_step": next_step, f"context.{context_key}": user_message}
     
-    # Update conversation in database
-    await db.conversations.replace_one({"id": conversation_id}, conversation)
+    # Append both messages and advance the step in a single atomic update
+    update["$push"] = {"messages": {"$each": [
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": assistant_response}
+    ]}}
+    # Only applies if no concurrent message advanced the step since the read above
+    conversation = await db.conversations.find_one_and_update(
+        {"id": conversation_id, "current_step": current_step},
+        update,
+        projection={"current_step": 1, "_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not conversation:
+        raise HTTPException(status_code=409, detail="Conversation was updated concurrently, please retry")
     
     return {"response": assistant_response, "step": conversation["current_step"]}
 
-@api_router.post("/analyze/{conversation_id}")
+@api_router.post("/analyze/{conversation_id}", response_model=ProjectEstimate)
 async def analyze_project(conversation_id: str):
     """Analyze project and generate estimates"""
     # Retrieve conversation
-    conversation = await db.conversations.find_one({"id": conversation_id})
+    conversation = await db.conversations.find_one({"id": conversation_id}, projection={"context": 1, "project_id": 1, "_id": 0})
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
@@ -493,75 +641,98 @@ async def analyze_project(conversation_id: str):
         decomposition = await decompose_project_with_groq(project_data)
         
         # Process tasks and calculate estimates
+        task_list = decomposition.get("tasks", [])
+        
+        # Calculate PERT estimates for all tasks at once
+        opt = np.array([t.get("optimistic_days", 5) for t in task_list], dtype=float)
+        ml = np.array([t.get("most_likely_days", 10) for t in task_list], dtype=float)
+        pess = np.array([t.get("pessimistic_days", 15) for t in task_list], dtype=float)
+        expected = calculate_pert_estimate(opt, ml, pess)
+        
+        # Calculate cost - flatten roles across tasks and sum hours * rate per task
+        task_idx, hours_flat, rate_flat = [], [], []
+        for i, task_data in enumerate(task_list):
+            for role_data in task_data.get("roles", []):
+                task_idx.append(i)
+                hours_flat.append(role_data.get("hours_most_likely", 40))
+                rate_flat.append(DEFAULT_RATES.get(role_data.get("role", "Developer"), 1000))
+        task_costs = np.bincount(
+            np.array(task_idx, dtype=np.intp),
+            weights=np.array(hours_flat, dtype=float) * np.array(rate_flat, dtype=float),
+            minlength=len(task_list)
+        )
+        total_cost = float(task_costs.sum())
+        
+        # Build task documents directly from the parsed LLM output
         tasks = []
-        total_cost = 0
         dependencies = {}
         
-        for task_data in decomposition.get("tasks", []):
-            # Calculate PERT estimates
-            opt_days = task_data.get("optimistic_days", 5)
-            ml_days = task_data.get("most_likely_days", 10)
-            pess_days = task_data.get("pessimistic_days", 15)
-            expected_days = calculate_pert_estimate(opt_days, ml_days, pess_days)
-            
-            # Calculate cost
-            task_cost = 0
-            for role_data in task_data.get("roles", []):
-                role = role_data.get("role", "Developer")
-                hours = role_data.get("hours_most_likely", 40)
-                rate = DEFAULT_RATES.get(role, 1000)
-                task_cost += hours * rate
-            
-            task = TaskEstimate(
-                id=task_data.get("id", str(uuid.uuid4())),
-                title=task_data.get("title", "Unnamed Task"),
-                description=task_data.get("description", ""),
-                category=task_data.get("category", "General"),
-                acceptance_criteria=task_data.get("acceptance_criteria", []),
-                dependencies=task_data.get("dependencies", []),
-                roles=task_data.get("roles", []),
-                optimistic_days=opt_days,
-                most_likely_days=ml_days,
-                pessimistic_days=pess_days,
-                expected_days=expected_days,
-                risk=task_data.get("risk", "medium"),
-                priority=task_data.get("priority", "medium")
-            )
+        for task_data, opt_days, ml_days, pess_days, expected_days, task_cost in zip(
+            task_list, opt.tolist(), ml.tolist(), pess.tolist(), expected.tolist(), task_costs.tolist()
+        ):
+            task = {
+                "id": task_data.get("id", str(uuid.uuid4())),
+                "title": task_data.get("title", "Unnamed Task"),
+                "description": task_data.get("description", ""),
+                "category": task_data.get("category", "General"),
+                "acceptance_criteria": task_data.get("acceptance_criteria", []),
+                "dependencies": task_data.get("dependencies", []),
+                "roles": task_data.get("roles", []),
+                "optimistic_days": opt_days,
+                "most_likely_days": ml_days,
+                "pessimistic_days": pess_days,
+                "expected_days": expected_days,
+                "cost": task_cost,
+                "risk": task_data.get("risk", "medium"),
+                "priority": task_data.get("priority", "medium")
+            }
             
             tasks.append(task)
-            total_cost += task_cost
-            dependencies[task.id] = task.dependencies
+            dependencies[task["id"]] = task["dependencies"]
         
         # Calculate critical path
-        task_dicts = [{"id": t.id, "expected_days": t.expected_days} for t in tasks]
-        critical_path = calculate_critical_path(task_dicts, dependencies)
+        critical_path, critical_path_days = calculate_critical_path(tasks, dependencies)
         
         # Calculate timeline
-        total_duration = sum(t.expected_days for t in tasks if t.id in critical_path) if critical_path else sum(t.expected_days for t in tasks)
+        total_duration = critical_path_days if critical_path else sum(t["expected_days"] for t in tasks)
         start_date = datetime.now()
         end_date = start_date + timedelta(days=total_duration)
         
-        # Create project estimate
-        estimate = ProjectEstimate(
-            project_id=conversation["project_id"],
-            tasks=tasks,
-            total_cost=total_cost,
-            total_duration_days=total_duration,
-            critical_path=critical_path,
-            start_date=start_date.isoformat(),
-            end_date=end_date.isoformat(),
-            resource_allocation={"rates": DEFAULT_RATES}
-        )
+        # Create project estimate document (same shape as ProjectEstimate)
+        estimate = {
+            "id": str(uuid.uuid4()),
+            "project_id": conversation["project_id"],
+            "tasks": tasks,
+            "total_cost": total_cost,
+            "total_duration_days": total_duration,
+            "critical_path": critical_path,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "resource_allocation": {"rates": DEFAULT_RATES},
+            "created_at": datetime.utcnow()
+        }
         
-        # Save to database
-        await db.project_estimates.insert_one(estimate.dict())
+        # Save the estimate and link it from the conversation concurrently.
+        # Estimates can be regenerated, so skip waiting on the journal.
+        estimates = db.project_estimates.with_options(write_concern=WriteConcern(w=1, j=False))
+        await asyncio.gather(
+            estimates.insert_one(dict(estimate)),
+            db.conversations.update_one(
+                {"id": conversation_id},
+                {"$set": {"analyzed_at": estimate["created_at"], "estimate_id": estimate["id"]}}
+            )
+        )
         
-        return estimate
+        # Serialize once with orjson, bypassing FastAPI's jsonable_encoder pass
+        return Response(
+            content=orjson.dumps(estimate, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-@api_router.get("/estimates/{project_id}")
+@api_router.get("/estimates/{project_id}", response_model=ProjectEstimate)
 async def get_project_estimate(project_id: str):
     """Get project estimate by project ID"""
     estimate = await db.project_estimates.find_one({"project_id": project_id})
@@ -596,7 +767,3 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from server import calculate_critical_path
+
+
+def make_tasks(durations):
+    return [{"id": task_id, "expected_days": days} for task_id, days in durations.items()]
+
+
+def test_chain():
+    tasks = make_tasks({"A": 1, "B": 2, "C": 3})
+    dependencies = {"A": [], "B": ["A"], "C": ["B"]}
+    assert calculate_critical_path(tasks, dependencies) == (["A", "B", "C"], 6)
+
+
+def test_diamond_follows_longest_branch():
+    tasks = make_tasks({"A": 2, "B": 4, "D": 1, "C": 2})
+    dependencies = {"A": [], "B": ["A"], "D": ["A"], "C": ["B", "D"]}
+    assert calculate_critical_path(tasks, dependencies) == (["A", "B", "C"], 8)
+
+
+def test_flat_graph_returns_longest_task():
+    tasks = make_tasks({"A": 3, "B": 7, "C": 5})
+    dependencies = {"A": [], "B": [], "C": []}
+    assert calculate_critical_path(tasks, dependencies) == (["B"], 7)
+
+
+def test_cycle_returns_empty_path():
+    tasks = make_tasks({"A": 1, "B": 2, "C": 3})
+    dependencies = {"A": ["C"], "B": ["A"], "C": ["B"]}
+    assert calculate_critical_path(tasks, dependencies) == ([], 0.0)
+
+
+def test_unknown_dependencies_are_ignored():
+    tasks = make_tasks({"A": 2, "B": 3})
+    dependencies = {"A": ["T0"], "B": ["A", "missing"], "X": ["A"]}
+    assert calculate_critical_path(tasks, dependencies) == (["A", "B"], 5)
+
+
+def test_empty_task_list():
+    assert calculate_critical_path([], {}) == ([], 0.0)